@@ -7,28 +7,118 @@ that converts natural language to safe bash commands.
 import os
 import sys
 import json
+import time
+import atexit
+import queue
+import hashlib
 import logging
+import logging.handlers
 import subprocess
 import argparse
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-import openai
-from openai import OpenAI
 import shlex
 import re
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ai-cli.log'),
-        logging.StreamHandler()
-    ]
+from defaults import DEFAULT_CONFIG
+
+try:
+    import orjson  # C-implemented JSON, ~5-10x faster than stdlib
+except ImportError:
+    orjson = None
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.history import FileHistory
+except ImportError:  # Optional; the REPL falls back to plain input()
+    PromptSession = None
+
+
+def _json_loads(data) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when available."""
+    if orjson:
+        # default=list renders the frozensets in DEFAULT_CONFIG
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=list)
+    return json.dumps(obj, indent=2 if indent else None, default=list).encode()
+
+# Configure logging: the REPL thread only enqueues records; a background
+# listener formats and writes them. The log file opens lazily (delay=True)
+# and only receives warnings and above.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+_file_handler = logging.FileHandler('ai-cli.log', delay=True)
+_file_handler.setLevel(logging.WARNING)
+_file_handler.setFormatter(_log_formatter)
+
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Dangerous patterns compiled once at import so validate_command does a single
+# scan instead of recompiling/searching 12 patterns per call
+_DANGEROUS_PATTERNS = [
+    r'rm\s+-rf\s+/',
+    r'dd\s+if=.*\s+of=/dev/',
+    r'mkfs\s+.*',
+    r'fdisk\s+.*',
+    r'shutdown\s+.*',
+    r'reboot\s+.*',
+    r'killall\s+.*',
+    r'pkill\s+.*',
+    r'>\s*/dev/',
+    r'>>\s*/dev/',
+    r'\|\s*tee\s+/dev/',
+]
+_DANGEROUS_RE = re.compile(
+    "|".join(f"(?:{p})" for p in _DANGEROUS_PATTERNS), re.IGNORECASE
+)
+
+# Redirects into system paths stripped by sanitize_command
+_SANITIZE_RE = re.compile(r'[>|]\s*/(?:dev/[a-zA-Z]+|etc/|var/|usr/)')
+
+# Cached AI responses expire after a day
+_CACHE_TTL_SECONDS = 86400
+
+# Built once at import; sending an identical prompt prefix on every call
+# also lets OpenAI's automatic prompt caching reuse the server-side KV
+# cache once the prefix is long enough to qualify
+SYSTEM_PROMPT = """Convert the user's request into one safe, non-destructive bash command.
+Use standard Unix/Linux commands and prefer showing information over modifying files.
+Output ONLY the command, no explanations.
+If the request is unclear or potentially dangerous, respond with: "CLARIFICATION_NEEDED: [explanation]" """
+
+# Canned exchanges sent before the real request; a few examples markedly
+# improve first-try accuracy, and as part of the constant prefix they are
+# covered by server-side prompt caching
+CANNED_EXAMPLES = [
+    {"role": "user", "content": "list files"},
+    {"role": "assistant", "content": "ls"},
+    {"role": "user", "content": "find all Python files"},
+    {"role": "assistant", "content": "find . -name '*.py'"},
+    {"role": "user", "content": "show disk usage"},
+    {"role": "assistant", "content": "df -h"},
+]
+
 class ConfigManager:
     """Manages configuration for the AI CLI tool."""
     
@@ -38,34 +128,16 @@ class ConfigManager:
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default."""
-        default_config = {
-            "openai_api_key": os.getenv("OPENAI_API_KEY"),
-            "model": "gpt-4o-mini",
-            "max_tokens": 1000,
-            "temperature": 0.1,
-            "safe_mode": True,
-            "allowed_commands": [
-                "ls", "pwd", "cd", "cat", "head", "tail", "grep", "find",
-                "mkdir", "rmdir", "cp", "mv", "rm", "chmod", "chown",
-                "ps", "top", "df", "du", "tar", "zip", "unzip",
-                "git", "docker", "kubectl", "aws", "terraform"
-            ],
-            "forbidden_commands": [
-                "rm -rf /", "dd", "mkfs", "fdisk", "format",
-                "shutdown", "reboot", "init", "killall", "pkill"
-            ],
-            "max_command_length": 500,
-            "history_file": "ai-cli-history.json"
-        }
-        
+        default_config = dict(DEFAULT_CONFIG)
+
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    loaded_config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    loaded_config = _json_loads(f.read())
                     # Merge with defaults to ensure all keys exist
                     default_config.update(loaded_config)
                     return default_config
-            except (json.JSONDecodeError, IOError) as e:
+            except (ValueError, IOError) as e:
                 logger.warning(f"Error loading config: {e}. Using defaults.")
                 return default_config
         else:
@@ -76,8 +148,8 @@ class ConfigManager:
     def _save_config(self, config: Dict[str, Any]) -> None:
         """Save configuration to file."""
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            with open(self.config_path, 'wb') as f:
+                f.write(_json_dumps(config, indent=True))
         except IOError as e:
             logger.error(f"Error saving config: {e}")
     
@@ -98,104 +170,158 @@ class CommandValidator:
         self.allowed_commands = set(config.get("allowed_commands", []))
         self.forbidden_commands = set(config.get("forbidden_commands", []))
         self.max_length = config.get("max_command_length", 500)
+        # One case-insensitive alternation instead of N substring scans per command
+        self._forbidden_re = re.compile(
+            "|".join(re.escape(w) for w in self.forbidden_commands), re.IGNORECASE
+        ) if self.forbidden_commands else None
     
-    def validate_command(self, command: str) -> tuple[bool, str]:
+    def validate_command(self, command: str) -> tuple[bool, str, List[str]]:
         """
         Validate command for safety.
-        Returns (is_safe, error_message)
+        Returns (is_safe, error_message, argv) where argv is the parsed
+        command ready for shell-free execution.
         """
         if not command.strip():
-            return False, "Empty command"
-        
+            return False, "Empty command", []
+
         if len(command) > self.max_length:
-            return False, f"Command too long (max {self.max_length} characters)"
-        
+            return False, f"Command too long (max {self.max_length} characters)", []
+
+        # Shell operators would be passed to the child process as literal
+        # arguments now that execution doesn't go through /bin/sh
+        if any(ch in command for ch in '|&;<>'):
+            return False, "Shell operators (| & ; < >) are not supported", []
+
         # Check for forbidden patterns
-        command_lower = command.lower()
-        for forbidden in self.forbidden_commands:
-            if forbidden in command_lower:
-                return False, f"Forbidden command pattern detected: {forbidden}"
-        
-        # Check for dangerous patterns
-        dangerous_patterns = [
-            r'rm\s+-rf\s+/',
-            r'dd\s+if=.*\s+of=/dev/',
-            r'mkfs\s+.*',
-            r'fdisk\s+.*',
-            r'shutdown\s+.*',
-            r'reboot\s+.*',
-            r'killall\s+.*',
-            r'pkill\s+.*',
-            r'>\s*/dev/',
-            r'>>\s*/dev/',
-            r'|\s*tee\s+/dev/',
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, command_lower):
-                return False, f"Dangerous command pattern detected: {pattern}"
-        
-        # Check if command starts with allowed commands
-        parts = shlex.split(command)
+        if self._forbidden_re:
+            match = self._forbidden_re.search(command)
+            if match:
+                return False, f"Forbidden command pattern detected: {match.group(0)}", []
+
+        # Check for dangerous patterns (single pass over the precompiled alternation)
+        match = _DANGEROUS_RE.search(command)
+        if match:
+            return False, f"Dangerous command pattern detected: {match.group(0)}", []
+
+        # Check if command starts with allowed commands. Most commands are
+        # plain whitespace-separated tokens, which str.split handles without
+        # the Python-level shlex tokenizer; quotes and escapes fall back
+        if '"' in command or "'" in command or '\\' in command:
+            try:
+                parts = shlex.split(command)
+            except ValueError as e:
+                return False, f"Unparseable command: {e}", []
+        else:
+            parts = command.split()
         if parts and parts[0] not in self.allowed_commands:
-            return False, f"Command '{parts[0]}' not in allowed list"
-        
-        return True, ""
+            return False, f"Command '{parts[0]}' not in allowed list", []
+
+        return True, "", parts
     
     def sanitize_command(self, command: str) -> str:
         """Sanitize command by removing potentially dangerous parts."""
         # Remove any attempts to redirect to system files
-        command = re.sub(r'[>|]\s*/dev/[a-zA-Z]+', '', command)
-        command = re.sub(r'[>|]\s*/etc/', '', command)
-        command = re.sub(r'[>|]\s*/var/', '', command)
-        command = re.sub(r'[>|]\s*/usr/', '', command)
-        
-        return command.strip()
+        return _SANITIZE_RE.sub('', command).strip()
 
 class AICommandGenerator:
     """Generates bash commands from natural language using AI."""
-    
+
     def __init__(self, config: ConfigManager):
         self.config = config
-        api_key = config.get("openai_api_key")
-        if not api_key:
-            raise ValueError("OpenAI API key not configured. Please set it in the config file.")
-        
-        self.client = OpenAI(api_key=api_key)
+        self._api_key = config.get("openai_api_key")
+        self.client = None
         self.model = config.get("model", "gpt-4o-mini")
         self.max_tokens = config.get("max_tokens", 1000)
         self.temperature = config.get("temperature", 0.1)
-    
-    def generate_command(self, user_input: str) -> str:
-        """Generate bash command from natural language input."""
-        system_prompt = """You are a helpful AI assistant that converts natural language requests into safe bash commands.
+        self.cache_file = Path(".ai-cli-cache.json")
+        self._cache = self._load_cache()
 
-IMPORTANT RULES:
-1. Only generate safe, non-destructive commands
-2. Use standard Unix/Linux commands
-3. Avoid commands that can delete files without confirmation
-4. Prefer commands that show information rather than modify files
-5. If the request is unclear or potentially dangerous, ask for clarification
-6. Return ONLY the command, no explanations unless clarification is needed
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load the response cache from file."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    return _json_loads(f.read())
+            except (ValueError, IOError):
+                return {}
+        return {}
+
+    def _save_cache(self) -> None:
+        """Save the response cache to file."""
+        try:
+            with open(self.cache_file, 'wb') as f:
+                f.write(_json_dumps(self._cache, indent=True))
+        except IOError as e:
+            logger.warning(f"Error saving response cache: {e}")
 
-Common safe commands: ls, pwd, cat, head, tail, grep, find, ps, df, du, git status, etc.
+    def _ensure_client(self) -> None:
+        """
+        Import openai and build the client on first use. The import pulls
+        in httpx/pydantic and costs ~200ms, so direct commands and --help
+        shouldn't pay for it.
+        """
+        if self.client is None:
+            if not self._api_key:
+                raise ValueError("OpenAI API key not configured. Please set it in the config file.")
+            from openai import OpenAI
+            self.client = OpenAI(api_key=self._api_key)
 
-If the request is unclear or potentially dangerous, respond with: "CLARIFICATION_NEEDED: [explanation]"
+    def _cache_key(self, user_input: str) -> str:
+        """Build a cache key from the model, temperature and input."""
+        raw = f"{self.model}|{self.temperature}|{user_input}"
+        return hashlib.sha256(raw.encode()).hexdigest()
 
-User request: """
+    def generate_command(self, user_input: str) -> str:
+        """Generate bash command from natural language input."""
+        # Repeated requests skip the API round-trip entirely; higher
+        # temperatures are expected to vary, so bypass the cache there
+        cache_key = None
+        if self.temperature <= 0.3:
+            cache_key = self._cache_key(user_input)
+            cached = self._cache.get(cache_key)
+            if cached and time.time() - cached["timestamp"] < _CACHE_TTL_SECONDS:
+                return cached["command"]
 
         try:
+            self._ensure_client()
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    *CANNED_EXAMPLES,
                     {"role": "user", "content": user_input}
                 ],
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                stop=["\n\n", "```"],  # Halt generation at a command boundary
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=15  # Don't let a hung connection freeze the REPL
             )
-            
-            command = response.choices[0].message.content.strip()
+
+            # Print tokens as they arrive so the user sees the command forming
+            # instead of waiting for the full response
+            chunks = []
+            usage = None
+            for chunk in response:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    sys.stdout.write(delta)
+                    sys.stdout.flush()
+                    chunks.append(delta)
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+
+            if usage and getattr(usage, "prompt_tokens_details", None):
+                cached = usage.prompt_tokens_details.cached_tokens or 0
+                if cached:
+                    logger.info(f"Prompt cache hit: {cached}/{usage.prompt_tokens} prompt tokens")
+
+            command = "".join(chunks).strip()
             
             # Remove markdown code blocks if present
             if command.startswith("```") and command.endswith("```"):
@@ -204,51 +330,130 @@ User request: """
                 command = command[7:].strip()
                 if command.endswith("```"):
                     command = command[:-3].strip()
-            
+
+            if cache_key and not command.startswith(("ERROR:", "CLARIFICATION_NEEDED:")):
+                self._cache[cache_key] = {"timestamp": time.time(), "command": command}
+                self._save_cache()
+
             return command
             
         except Exception as e:
             logger.error(f"Error generating command: {e}")
             return f"ERROR: Failed to generate command - {str(e)}"
 
+    def generate_batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Generate commands for many prompts via the OpenAI Batch API.
+        Trades latency (results can take minutes to hours) for half the
+        token cost, so it only makes sense for non-interactive workloads.
+        Returns one command (or None) per prompt, in order.
+        """
+        import tempfile
+
+        self._ensure_client()
+
+        lines = []
+        for i, prompt in enumerate(prompts):
+            lines.append(json.dumps({
+                "custom_id": f"ai-cli-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        *CANNED_EXAMPLES,
+                        {"role": "user", "content": prompt}
+                    ],
+                    "max_tokens": self.max_tokens,
+                    "temperature": self.temperature
+                }
+            }))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+            requests_path = f.name
+
+        try:
+            with open(requests_path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.unlink(requests_path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(prompts)} requests")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(30)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} finished with status '{batch.status}'")
+
+        output = self.client.files.content(batch.output_file_id)
+        results: List[Optional[str]] = [None] * len(prompts)
+        for line in output.text.splitlines():
+            item = json.loads(line)
+            index = int(item["custom_id"].rsplit("-", 1)[1])
+            if item.get("response") and item["response"]["status_code"] == 200:
+                content = item["response"]["body"]["choices"][0]["message"]["content"]
+                results[index] = content.strip()
+        return results
+
 class CommandExecutor:
     """Executes commands safely with proper error handling."""
     
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, validator: Optional[CommandValidator] = None):
         self.config = config
-        self.validator = CommandValidator(config)
+        self.validator = validator or CommandValidator(config)
     
     def execute_command(self, command: str) -> tuple[str, int]:
         """
         Execute command safely.
         Returns (output, exit_code)
         """
-        # Validate command
-        is_safe, error_msg = self.validator.validate_command(command)
+        # Validate command and reuse the argv it already parsed
+        is_safe, error_msg, parts = self.validator.validate_command(command)
         if not is_safe:
             return f"ERROR: {error_msg}", 1
-        
-        # Sanitize command
-        sanitized_command = self.validator.sanitize_command(command)
-        
+
         try:
-            # Execute command
-            result = subprocess.run(
-                sanitized_command,
-                shell=True,
-                capture_output=True,
+            # Stream output to the terminal as it arrives instead of
+            # buffering everything in memory; keep the tail for history
+            process = subprocess.Popen(
+                parts,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=30  # 30 second timeout
+                bufsize=1
             )
-            
-            output = result.stdout
-            if result.stderr:
-                output += f"\nSTDERR: {result.stderr}"
-            
-            return output, result.returncode
-            
-        except subprocess.TimeoutExpired:
-            return "ERROR: Command timed out after 30 seconds", 1
+
+            timed_out = threading.Event()
+
+            def _kill_on_timeout():
+                timed_out.set()
+                process.kill()
+
+            watchdog = threading.Timer(30, _kill_on_timeout)  # 30 second timeout
+            watchdog.start()
+            ring = deque(maxlen=1024)
+            try:
+                for line in process.stdout:
+                    print(line, end='')
+                    ring.append(line)
+                exit_code = process.wait()
+            finally:
+                watchdog.cancel()
+
+            if timed_out.is_set():
+                return "ERROR: Command timed out after 30 seconds", 1
+
+            return "".join(ring), exit_code
+
         except Exception as e:
             logger.error(f"Error executing command '{command}': {e}")
             return f"ERROR: Failed to execute command - {str(e)}", 1
@@ -256,20 +461,30 @@ class CommandExecutor:
 class HistoryManager:
     """Manages command history."""
     
+    # Flush to disk after this many queued entries (or a 1s lull)
+    FLUSH_BATCH = 16
+
     def __init__(self, history_file: str):
         self.history_file = Path(history_file)
         self.history = self._load_history()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
     
     def _load_history(self) -> List[Dict[str, Any]]:
-        """Load command history from file."""
+        """Load command history from file (one JSON entry per line)."""
+        history = []
         if self.history_file.exists():
             try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return []
-        return []
-    
+                with open(self.history_file, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            history.append(_json_loads(line))
+            except (ValueError, IOError):
+                return history
+        return history
+
     def add_entry(self, user_input: str, generated_command: str, output: str, exit_code: int):
         """Add a new entry to history."""
         entry = {
@@ -280,15 +495,32 @@ class HistoryManager:
             "exit_code": exit_code
         }
         self.history.append(entry)
-        self._save_history()
-    
-    def _save_history(self):
-        """Save history to file."""
+        self._queue.put(entry)
+
+    def _writer_loop(self):
+        """Drain queued entries and write them in batches off the REPL thread."""
+        while True:
+            entries = [self._queue.get()]
+            try:
+                while len(entries) < self.FLUSH_BATCH:
+                    entries.append(self._queue.get(timeout=1))
+            except queue.Empty:
+                pass
+            self._write_entries(entries)
+            for _ in entries:
+                self._queue.task_done()
+
+    def _write_entries(self, entries: List[Dict[str, Any]]):
+        """Append entries to the history file in a single write."""
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
+            with open(self.history_file, 'ab') as f:
+                f.write(b"".join(_json_dumps(entry) + b"\n" for entry in entries))
         except IOError as e:
             logger.error(f"Error saving history: {e}")
+
+    def flush(self):
+        """Block until every queued entry has been written to disk."""
+        self._queue.join()
     
     def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent history entries."""
@@ -297,14 +529,30 @@ class HistoryManager:
 class AICLI:
     """Main AI CLI application."""
     
-    def __init__(self):
-        self.config = ConfigManager()
+    def __init__(self, config: Optional[ConfigManager] = None):
+        self.config = config or ConfigManager()
+        # Read once; config changes take effect on restart
+        self._safe_mode = self.config.get("safe_mode", True)
         self.validator = CommandValidator(self.config)
         self.ai_generator = AICommandGenerator(self.config)
-        self.executor = CommandExecutor(self.config)
-        self.history = HistoryManager(self.config.get("history_file", "ai-cli-history.json"))
+        self.executor = CommandExecutor(self.config, self.validator)
+        self.history = HistoryManager(self.config.get("history_file", "ai-cli-history.jsonl"))
+        if PromptSession is not None:
+            # In-process input history plus tab-completion over the allowlist
+            self._session = PromptSession(
+                history=FileHistory(".ai-cli-input-history"),
+                completer=WordCompleter(sorted(self.validator.allowed_commands))
+            )
+        else:
+            self._session = None
+
+    def _read_input(self, prompt: str) -> str:
+        """Read a line with prompt_toolkit when available, else input()."""
+        if self._session is not None:
+            return self._session.prompt(prompt)
+        return input(prompt)
     
-    def setup(self):
+    def setup(self, check_api: bool = False):
         """Initial setup and configuration check."""
         api_key = self.config.get("openai_api_key")
         if not api_key:
@@ -312,20 +560,58 @@ class AICLI:
             print("Please set your OpenAI API key in the config file.")
             print(f"Config file: {self.config.config_path}")
             return False
-        
-        try:
-            # Test API connection
-            test_response = self.ai_generator.generate_command("list current directory")
-            if test_response.startswith("ERROR:"):
-                print(f"❌ API connection failed: {test_response}")
+
+        if check_api:
+            # Validate the key and model with a single GET instead of a
+            # billable chat completion
+            try:
+                self.ai_generator._ensure_client()
+            except Exception as e:
+                print(f"❌ Setup failed: {e}")
                 return False
-        except Exception as e:
-            print(f"❌ Setup failed: {e}")
-            return False
-        
+
+            import openai
+            try:
+                self.ai_generator.client.models.retrieve(self.ai_generator.model)
+            except openai.AuthenticationError:
+                print("❌ OpenAI API key was rejected")
+                return False
+            except openai.NotFoundError:
+                print(f"❌ Model '{self.ai_generator.model}' is not available")
+                return False
+            except Exception as e:
+                print(f"❌ API connection failed: {e}")
+                return False
+
         print("✅ AI CLI initialized successfully!")
         return True
     
+    def run_batch(self, path: str) -> bool:
+        """Generate commands for each prompt in a file via the Batch API."""
+        try:
+            with open(path, 'r') as f:
+                prompts = [line.strip() for line in f if line.strip()]
+        except IOError as e:
+            print(f"❌ Could not read batch file: {e}")
+            return False
+
+        if not prompts:
+            print("❌ Batch file is empty")
+            return False
+
+        print(f"📦 Submitting {len(prompts)} prompts to the Batch API (this can take a while)...")
+        try:
+            results = self.ai_generator.generate_batch(prompts)
+        except Exception as e:
+            logger.error(f"Batch generation failed: {e}")
+            print(f"❌ Batch generation failed: {e}")
+            return False
+
+        for prompt, command in zip(prompts, results):
+            print(f"📝 {prompt}")
+            print(f"   → {command if command else 'ERROR: no response'}")
+        return True
+
     def run(self):
         """Main application loop."""
         print("🤖 AI CLI - Natural Language to Bash Commands")
@@ -335,7 +621,7 @@ class AICLI:
         
         while True:
             try:
-                user_input = input("🤖 > ").strip()
+                user_input = self._read_input("🤖 > ").strip()
                 
                 if not user_input:
                     continue
@@ -360,7 +646,9 @@ class AICLI:
                 if user_input.startswith("!"):
                     command = user_input[1:].strip()
                     output, exit_code = self.executor.execute_command(command)
-                    print(f"Output:\n{output}")
+                    # Regular output is streamed live; only errors need printing
+                    if output.startswith("ERROR:"):
+                        print(output)
                     if exit_code != 0:
                         print(f"Exit code: {exit_code}")
                     continue
@@ -380,7 +668,7 @@ class AICLI:
                 print(f"🔧 Generated command: {generated_command}")
                 
                 # Ask for confirmation if safe mode is enabled
-                if self.config.get("safe_mode", True):
+                if self._safe_mode:
                     confirm = input("Execute this command? (y/n): ").strip().lower()
                     if confirm not in ['y', 'yes']:
                         print("❌ Command cancelled")
@@ -392,9 +680,10 @@ class AICLI:
                 
                 # Store in history
                 self.history.add_entry(user_input, generated_command, output, exit_code)
-                
-                # Display output
-                print(f"📋 Output:\n{output}")
+
+                # Regular output is streamed live; only errors need printing
+                if output.startswith("ERROR:"):
+                    print(f"❌ {output}")
                 if exit_code != 0:
                     print(f"⚠️  Exit code: {exit_code}")
                 
@@ -466,21 +755,25 @@ def main():
     parser = argparse.ArgumentParser(description="AI CLI - Natural Language to Bash Commands")
     parser.add_argument("--config", help="Path to config file")
     parser.add_argument("--no-safe-mode", action="store_true", help="Disable safe mode")
+    parser.add_argument("--check", action="store_true", help="Verify the API connection at startup")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Generate commands for each line of FILE via the Batch API (half price, slower)")
     args = parser.parse_args()
     
     try:
-        cli = AICLI()
-        
-        # Override config if specified
-        if args.config:
-            cli.config = ConfigManager(args.config)
+        # Resolve config overrides before components snapshot their settings
+        config = ConfigManager(args.config) if args.config else ConfigManager()
         if args.no_safe_mode:
-            cli.config.set("safe_mode", False)
-        
-        if cli.setup():
-            cli.run()
-        else:
+            config.set("safe_mode", False)
+        cli = AICLI(config)
+
+        if not cli.setup(check_api=args.check):
             sys.exit(1)
+
+        if args.batch:
+            sys.exit(0 if cli.run_batch(args.batch) else 1)
+
+        cli.run()
             
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
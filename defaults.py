@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared default configuration for the AI CLI tool.
+
+Both the runtime (ai-cli.py) and the setup script read this single
+definition, so the two can't silently diverge. The command lists are
+frozensets: parsed once at import and shared structurally by every
+consumer. Serialize with default=list when writing to JSON.
+"""
+
+import os
+
+DEFAULT_CONFIG = {
+    "openai_api_key": os.getenv("OPENAI_API_KEY"),
+    "model": "gpt-4o-mini",
+    "max_tokens": 64,
+    "temperature": 0.1,
+    "safe_mode": True,
+    "allowed_commands": frozenset([
+        "ls", "pwd", "cd", "cat", "head", "tail", "grep", "find",
+        "mkdir", "rmdir", "cp", "mv", "rm", "chmod", "chown",
+        "ps", "top", "df", "du", "tar", "zip", "unzip",
+        "git", "docker", "kubectl", "aws", "terraform"
+    ]),
+    "forbidden_commands": frozenset([
+        "rm -rf /", "dd", "mkfs", "fdisk", "format",
+        "shutdown", "reboot", "init", "killall", "pkill"
+    ]),
+    "max_command_length": 500,
+    "history_file": "ai-cli-history.jsonl"
+}
@@ -8,32 +8,16 @@ import sys
 import json
 from pathlib import Path
 
+from defaults import DEFAULT_CONFIG
+
 def create_config_file():
     """Create default configuration file."""
-    config = {
-        "openai_api_key": "",
-        "model": "gpt-4o-mini",
-        "max_tokens": 1000,
-        "temperature": 0.1,
-        "safe_mode": True,
-        "allowed_commands": [
-            "ls", "pwd", "cd", "cat", "head", "tail", "grep", "find",
-            "mkdir", "rmdir", "cp", "mv", "rm", "chmod", "chown",
-            "ps", "top", "df", "du", "tar", "zip", "unzip",
-            "git", "docker", "kubectl", "aws", "terraform"
-        ],
-        "forbidden_commands": [
-            "rm -rf /", "dd", "mkfs", "fdisk", "format",
-            "shutdown", "reboot", "init", "killall", "pkill"
-        ],
-        "max_command_length": 500,
-        "history_file": "ai-cli-history.json"
-    }
-    
+    config = dict(DEFAULT_CONFIG, openai_api_key="")
+
     config_path = Path("ai-cli-config.json")
     if not config_path.exists():
         with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+            json.dump(config, f, indent=2, default=list)
         print("✅ Created default configuration file: ai-cli-config.json")
     else:
         print("ℹ️  Configuration file already exists: ai-cli-config.json")